@@ -4,20 +4,135 @@ HTTP API endpoints for ForecastForge.
 This module defines the routes exposed by the FastAPI application.  It
 provides endpoints for initiating the model evaluation process
 (``/process``), checking the status of an evaluation task
-(``/results/{task_id}``), and re‑training a selected model to
+(``/results/{task_id}``) or of several tasks at once
+(``/results?ids=...``), streaming status changes of a task over a
+WebSocket (``/results/ws/{task_id}``), and re‑training a selected model to
 generate future forecasts (``/forecast``).  The actual heavy
 computation runs in Celery workers defined in ``app/worker/tasks.py``.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import asyncio
+import hashlib
+from typing import BinaryIO, Optional
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
+from celery import states
 from celery.result import AsyncResult
-import pandas as pd
-import io
+from redis import asyncio as aioredis
+import numpy as np
+
+from app.worker.celery_app import REDIS_URL, celery
+from app.worker.tasks import SERIES_DTYPE, run_all_models_task
 
-from app.worker.tasks import run_all_models_task
+__all__ = ["router"]
 
 router = APIRouter()
 
+# Bounds on the number of observations accepted by ``/process``.
+MIN_OBSERVATIONS = 12
+MAX_OBSERVATIONS = 120
+
+# Data type uploaded series are parsed and cached in.  Forecasts are
+# computed from these values in full precision whether the series comes
+# from a file or from the cache; only the payload sent to the workers
+# is reduced to ``SERIES_DTYPE``.
+PARSE_DTYPE = np.float64
+
+# Number of seconds a series parsed by ``/process`` stays cached in
+# Redis for later calls to ``/forecast``.
+SERIES_CACHE_TTL = 3600
+
+# Longest time in seconds a WebSocket waits for a task to finish.  It
+# is how long Celery keeps task results (``result_expires``), after
+# which no further updates can arrive, or ``None`` if they never expire.
+STREAM_TIMEOUT = celery.backend.prepare_expires(None)
+
+# Asynchronous Redis client used to watch task results and cache
+# parsed series without blocking the event loop.  Connections are
+# opened lazily.
+redis = aioredis.from_url(REDIS_URL)
+
+
+def _series_key(data_hash: str) -> str:
+    """Return the Redis key under which a parsed series is cached."""
+    return f"ff:csv:{data_hash}"
+
+
+def _task_payload(meta: dict) -> dict:
+    """Build the response for a task from its decoded result metadata.
+
+    Mirrors the responses of ``/results/{task_id}``: a finished task
+    returns its result dictionary, otherwise the status and progress
+    metadata are returned.
+
+    :param meta: The task metadata stored by the Celery result backend
+    :return: JSON describing the task status and metadata or result
+    """
+    if meta["status"] == states.SUCCESS:
+        return meta["result"]
+    return {"status": meta["status"], "meta": meta["result"] or {}}
+
+
+def _read_demanda(
+    source: BinaryIO,
+    max_values: Optional[int] = None,
+    dtype: np.dtype = PARSE_DTYPE,
+) -> np.ndarray:
+    """Parse the ``demanda`` column of an uploaded CSV file.
+
+    The file is streamed in 64 KiB blocks by PyArrow's CSV reader, so
+    it is never loaded into memory as a whole.  Only the ``demanda``
+    column is read, directly as ``dtype``, and missing values are
+    dropped.  This function blocks, so endpoints run it in a worker
+    thread.
+
+    :param source: A binary file object positioned at the start of
+        the CSV data
+    :param max_values: If given, stop reading as soon as more than
+        this many values have been found.  The returned array then
+        holds more than ``max_values`` values but not necessarily the
+        whole column.
+    :param dtype: The data type to read the values as
+    :raises HTTPException: if the column is missing or the file cannot
+        be parsed
+    :return: The non‑missing values of the ``demanda`` column
+    """
+    # PyArrow is only needed to parse uploads, so it is imported on
+    # first use rather than when the application starts.
+    import pyarrow as pa
+    import pyarrow.csv as pac
+
+    read_options = pac.ReadOptions(block_size=1 << 16)
+    convert_options = pac.ConvertOptions(
+        include_columns=['demanda'],
+        column_types={'demanda': pa.from_numpy_dtype(dtype)},
+    )
+    chunks = []
+    count = 0
+    try:
+        reader = pac.open_csv(source, read_options=read_options, convert_options=convert_options)
+        for batch in reader:
+            column = batch.column(0)
+            # Arrow tracks the number of nulls, so missing values only
+            # need to be filtered out of batches that actually have any.
+            if column.null_count:
+                column = column.drop_null()
+            chunks.append(column.to_numpy(zero_copy_only=False))
+            count += len(column)
+            if max_values is not None and count > max_values:
+                break
+    except pa.ArrowKeyError:
+        raise HTTPException(status_code=400, detail="El CSV debe tener una columna 'demanda'.")
+    except pa.ArrowInvalid as exc:
+        raise HTTPException(status_code=400, detail=f"El CSV no es válido: {exc}")
+    if not chunks:
+        return np.empty(0, dtype=dtype)
+    if len(chunks) == 1:
+        # Small files fit in a single block and need no concatenation
+        return chunks[0]
+    return np.concatenate(chunks)
+
 
 @router.post("/process")
 async def process_data(file: UploadFile = File(...)) -> dict[str, str]:
@@ -28,27 +143,34 @@ async def process_data(file: UploadFile = File(...)) -> dict[str, str]:
     containing a ``demanda`` column with between 12 and 120
     observations.  If validation passes a Celery task is queued
     asynchronously.  The caller receives a ``task_id`` which can be
-    polled using ``/results/{task_id}``.
+    polled using ``/results/{task_id}``, and a ``data_hash`` which
+    can be passed to ``/forecast`` instead of uploading the file
+    again while the parsed series remains cached.
 
     :param file: Uploaded CSV file
     :raises HTTPException: if the file format or contents are invalid
-    :return: JSON containing the Celery task ID
+    :return: JSON containing the Celery task ID and the series hash
     """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="El archivo debe ser un CSV.")
-    contents = await file.read()
     try:
-        df = pd.read_csv(io.BytesIO(contents))
-        if 'demanda' not in df.columns:
-            raise HTTPException(status_code=400, detail="El CSV debe tener una columna 'demanda'.")
-        data = df['demanda'].dropna().tolist()
-        if not (12 <= len(data) <= 120):
+        # Parse in a worker thread so the event loop keeps serving
+        # other requests meanwhile.  Oversized files are rejected
+        # without reading past the first values over the limit.
+        data = await asyncio.to_thread(_read_demanda, file.file, MAX_OBSERVATIONS)
+        if not (MIN_OBSERVATIONS <= len(data) <= MAX_OBSERVATIONS):
             raise HTTPException(status_code=400, detail="La serie debe tener entre 12 y 120 valores.")
+        # Cache the parsed series, keyed by its hash, so that
+        # ``/forecast`` can reuse it without parsing the file again.
+        cached = data.tobytes()
+        data_hash = hashlib.blake2b(cached, digest_size=16).hexdigest()
+        await redis.setex(_series_key(data_hash), SERIES_CACHE_TTL, cached)
         # Enqueue the Celery task; Celery returns an AsyncResult which
         # contains the task ID.  The computation happens in a
-        # background worker and will not block this request.
-        task = run_all_models_task.delay(data)
-        return {"task_id": task.id}
+        # background worker and will not block this request.  The
+        # series travels as the raw bytes of a ``SERIES_DTYPE`` array.
+        task = run_all_models_task.delay(data.astype(SERIES_DTYPE).tobytes())
+        return {"task_id": task.id, "data_hash": data_hash}
     except HTTPException:
         # Reraise explicit HTTP errors so FastAPI handles them
         raise
@@ -65,8 +187,9 @@ async def get_results(task_id: str) -> dict:
     of the corresponding Celery task.  If the task has finished
     executing the full result is returned.  Otherwise the status
     (``PENDING``, ``PROGRESS``) and any progress metadata are
-    returned.  The front‑end is expected to poll this endpoint until
-    the task completes.
+    returned.  The front‑end follows tasks over
+    ``/results/ws/{task_id}`` and only calls this endpoint once if
+    that socket closes before the task has finished.
 
     :param task_id: The Celery task ID to look up
     :return: JSON describing the task status and metadata or result
@@ -79,8 +202,125 @@ async def get_results(task_id: str) -> dict:
     return {"status": task_result.state, "meta": task_result.info or {}}
 
 
+@router.get("/results")
+async def get_results_bulk(ids: str = Query(...)) -> list[dict]:
+    """Return the current status or result of several evaluation tasks.
+
+    The result metadata of every task is fetched from Redis with a
+    single ``MGET``, so a dashboard following many tasks needs one
+    request and one round trip to Redis per refresh.  Each entry has
+    the same form as the response of ``/results/{task_id}``.
+
+    :param ids: Comma separated Celery task IDs to look up
+    :return: One status or result per task ID, in the order given
+    """
+    task_ids = [task_id for task_id in ids.split(",") if task_id]
+    if not task_ids:
+        return []
+    keys = [celery.backend.get_key_for_task(task_id) for task_id in task_ids]
+    raw_metas = await redis.mget(keys)
+    return [
+        _task_payload(celery.backend.decode(raw))
+        if raw is not None
+        else {"status": states.PENDING, "meta": {}}
+        for raw in raw_metas
+    ]
+
+
+async def _forward_updates(websocket: WebSocket, pubsub) -> None:
+    """Send every task update published on ``pubsub`` to the client.
+
+    :param websocket: The client WebSocket connection
+    :param pubsub: A Redis pub/sub subscribed to the task's result key
+    :return: Once an update reports that the task has finished
+    """
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        meta = celery.backend.decode(message["data"])
+        await websocket.send_json(_task_payload(meta))
+        if meta["status"] in states.READY_STATES:
+            return
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Return once the client has closed the WebSocket.
+
+    The client is not expected to send anything, so any other message
+    is ignored.
+
+    :param websocket: The client WebSocket connection
+    """
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/results/ws/{task_id}")
+async def stream_results(websocket: WebSocket, task_id: str) -> None:
+    """Push status changes for a Celery evaluation task over a WebSocket.
+
+    Every time the Redis result backend stores new state for a task it
+    also publishes it on a channel named after the task's result key.
+    This endpoint subscribes to that channel and forwards each update
+    to the client, so the front‑end does not need to poll
+    ``/results/{task_id}``.  The current state is sent once on
+    connect, and the socket is closed after the task finishes or after
+    ``STREAM_TIMEOUT`` seconds.  If the client leaves first, the
+    subscription is dropped straight away.
+
+    :param websocket: The client WebSocket connection
+    :param task_id: The Celery task ID to watch
+    """
+    await websocket.accept()
+    key = celery.backend.get_key_for_task(task_id)
+    pubsub = redis.pubsub()
+    try:
+        # Subscribe before reading the current state so that no update
+        # published in between is missed.
+        await pubsub.subscribe(key)
+        raw = await redis.get(key)
+        if raw is None:
+            meta = {"status": states.PENDING, "result": None}
+        else:
+            meta = celery.backend.decode(raw)
+        await websocket.send_json(_task_payload(meta))
+        if meta["status"] not in states.READY_STATES:
+            # Nothing is read from the socket while forwarding updates,
+            # so wait for a disconnect alongside to notice the client
+            # leaving while the task is still running.
+            updates = asyncio.create_task(_forward_updates(websocket, pubsub))
+            disconnect = asyncio.create_task(_wait_for_disconnect(websocket))
+            done, pending = await asyncio.wait(
+                {updates, disconnect},
+                timeout=STREAM_TIMEOUT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in pending:
+                task.cancel()
+            # Let the cancelled task unwind before its pub/sub or
+            # socket is closed below.
+            if pending:
+                await asyncio.wait(pending)
+            if disconnect in done:
+                return
+            if updates in done:
+                # Reraise a failed send, e.g. a disconnect
+                updates.result()
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Closing the pub/sub drops its connection, which also ends
+        # the subscription on the Redis side.
+        await pubsub.aclose()
+
+
 @router.post("/forecast")
-async def forecast(model_name: str, file: UploadFile = File(...)) -> dict:
+async def forecast(
+    model_name: str,
+    file: Optional[UploadFile] = File(None),
+    data_hash: Optional[str] = None,
+) -> ORJSONResponse:
     """Train a single model on the full dataset and return a 12‑month forecast.
 
     The front‑end can call this endpoint once a model has been
@@ -91,39 +331,58 @@ async def forecast(model_name: str, file: UploadFile = File(...)) -> dict:
     model class in your catalogue (see ``app/worker/tasks.ALL_MODELS``)
     and call its predict method.
 
+    The data can be given either as the original CSV file or as the
+    ``data_hash`` returned by ``/process``.  A cached series is used
+    when available; otherwise the file is parsed.
+
     :param model_name: The name of the model to train
     :param file: CSV file containing the original ``demanda`` column
-    :return: Predicted values and confidence intervals
+    :param data_hash: Hash of a series previously parsed by ``/process``
+    :return: Predicted values and confidence intervals, as one array
+        per field indexed by forecast period
     """
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="El archivo debe ser un CSV.")
-    contents = await file.read()
     try:
-        df = pd.read_csv(io.BytesIO(contents))
-        if 'demanda' not in df.columns:
-            raise HTTPException(status_code=400, detail="El CSV debe tener una columna 'demanda'.")
-        series = df['demanda'].dropna().astype(float)
+        series = None
+        if data_hash is not None:
+            cached = await redis.get(_series_key(data_hash))
+            if cached is not None:
+                series = np.frombuffer(cached, dtype=PARSE_DTYPE)
+        if series is None:
+            if file is None:
+                raise HTTPException(status_code=400, detail="Debe enviar un archivo CSV o un 'data_hash' vigente.")
+            if not file.filename.endswith('.csv'):
+                raise HTTPException(status_code=400, detail="El archivo debe ser un CSV.")
+            series = await asyncio.to_thread(_read_demanda, file.file)
         # In a real implementation you would retrieve the model
         # corresponding to ``model_name`` from ALL_MODELS, fit it on
         # ``series`` and compute the forecast.  Here we return a
         # dummy increasing sequence to illustrate the response
-        # structure.  Each forecast entry has a predicted value and
+        # structure.  Each forecast period has a predicted value and
         # arbitrary confidence interval bounds.
         forecast_horizon = 12
-        last_value = series.iloc[-1] if not series.empty else 0.0
-        predictions = []
-        for i in range(1, forecast_horizon + 1):
-            base = last_value * (1 + 0.05 * i)
-            predictions.append({
-                "period": i,
-                "prediction": base,
-                "lower_bound": base * 0.95,
-                "upper_bound": base * 1.05,
-            })
-        return {
-            "model_name": model_name,
-            "forecast": predictions,
-        }
+        last_value = float(series[-1]) if series.size else 0.0
+        # Compute every period of the horizon at once with NumPy.
+        # The rows of ``bounds`` hold the prediction and its lower
+        # and upper bounds.
+        periods = np.arange(1, forecast_horizon + 1)
+        bounds = np.empty((3, forecast_horizon))
+        bounds[0] = last_value * (1 + 0.05 * periods)
+        bounds[1] = bounds[0] * 0.95
+        bounds[2] = bounds[0] * 1.05
+        # ``ORJSONResponse`` renders with ``OPT_SERIALIZE_NUMPY``, so the
+        # arrays are returned as they are and serialised by orjson
+        # directly, without converting each value to a Python float.
+        return ORJSONResponse(
+            {
+                "model_name": model_name,
+                "forecast": {
+                    "period": periods,
+                    "prediction": bounds[0],
+                    "lower_bound": bounds[1],
+                    "upper_bound": bounds[2],
+                },
+            },
+        )
     except HTTPException:
         raise
     except Exception as exc:
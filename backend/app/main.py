@@ -8,15 +8,43 @@ prefix.  When run under uvicorn the application exposes a simple
 root endpoint for basic health checking.
 """
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.endpoints import router as api_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure the event loop for the lifetime of the application.
+
+    Blocking work such as CSV parsing is offloaded with
+    ``asyncio.to_thread``, which runs on the loop's default executor.
+    The executor is sized explicitly so that concurrent uploads are
+    parsed in parallel instead of queuing behind a few threads.
+    """
+    executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+    asyncio.get_running_loop().set_default_executor(executor)
+    yield
+    executor.shutdown(wait=False)
+
+
 # Create the FastAPI application with a descriptive title.  The
-# backend will serve requests made by the React front‑end.
-app = FastAPI(title="ForecastForge API")
+# backend will serve requests made by the React front‑end.  Responses
+# are encoded with orjson, which serialises floats in C and is
+# considerably faster than the standard library ``json`` module.
+app = FastAPI(
+    title="ForecastForge API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Allow the React front‑end running on localhost:3000 to make
 # cross‑origin requests to the API.  Without this configuration
@@ -32,6 +60,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses for clients that accept gzip.  Evaluation
+# results and forecasts are highly repetitive JSON, so they shrink
+# considerably, while small responses below ``minimum_size`` bytes
+# are sent as they are.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 
 @app.get("/")
 def root() -> dict[str, str]:
@@ -9,17 +9,81 @@ progress reporting for long‑running tasks.
 """
 
 from celery import Celery
+from kombu import Queue
 
 
+# Location of the Redis server used as broker and result backend.
+# The API also connects to it directly to watch task results.
+REDIS_URL = "redis://redis:6379/0"
+
 # Create the Celery application.  The name "tasks" identifies
 # the module to Celery and will be used when registering tasks.
 celery = Celery(
     "tasks",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0",
+    broker=REDIS_URL,
+    backend=REDIS_URL,
 )
 
 # Enable tracking when a task starts.  Without this setting the
 # ``task_state`` attribute would go directly from ``PENDING`` to
 # ``SUCCESS`` without intermediate progress updates.
-celery.conf.update(task_track_started=True)
\ No newline at end of file
+celery.conf.update(task_track_started=True)
+
+# Model fitting is parallelised inside each task with joblib, which
+# spreads the work over all available cores.  The default prefork pool
+# runs tasks in daemonic child processes, which cannot start processes
+# of their own, so joblib would silently fall back to fitting one model
+# at a time.  The solo pool executes tasks in the main worker process,
+# one at a time, leaving the cores to joblib.
+celery.conf.update(worker_pool="solo")
+
+# Serialise task arguments and results with msgpack instead of JSON.
+# The time series is sent as a raw ``float32`` byte buffer, which
+# msgpack transports as binary without converting every value to and
+# from its textual representation.
+celery.conf.update(
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack"],
+)
+
+# Keep broker connections alive between publishes so that batches of
+# tasks sent through a pooled producer reuse the same socket.  Tasks
+# that are not acknowledged within the visibility timeout are
+# redelivered to another worker.
+celery.conf.update(
+    broker_transport_options={
+        "socket_keepalive": True,
+        "visibility_timeout": 3600,
+    },
+)
+
+# Evaluations are long running, so each worker reserves only the task
+# it is executing instead of prefetching several and leaving them
+# waiting behind it.  Tasks are acknowledged after they finish, and
+# requeued if the worker process dies, so no evaluation is lost.
+celery.conf.update(
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+)
+
+# Route the model evaluation tasks to a dedicated queue so that the
+# workers fitting models can be scaled and configured separately.
+# Workers must consume this queue (``-Q models``).  The Redis
+# transport keeps every queue in a plain Redis list, so messages are
+# persisted according to the Redis server's own RDB/AOF settings.
+celery.conf.update(
+    task_queues=(Queue("models", routing_key="models"),),
+    task_routes={
+        "app.worker.tasks.run_all_models_task": {"queue": "models"},
+        "app.worker.tasks.run_one_model_task": {"queue": "models"},
+    },
+)
+
+# Namespace the result keys stored in Redis and expire them after an
+# hour so the backend does not grow without bound.
+celery.conf.update(
+    result_backend_transport_options={"global_keyprefix": "ff:"},
+    result_expires=3600,
+)
@@ -9,11 +9,12 @@ is reported back to the caller via Celery's state mechanism.
 
 from __future__ import annotations
 
-from typing import List, Dict, Any
-
+import os
 import time
-import pandas as pd
-from sklearn.metrics import mean_absolute_percentage_error
+from typing import Iterable, List, Dict, Any, Optional
+
+import numpy as np
+from celery.result import AsyncResult
 
 from .celery_app import celery
 
@@ -30,67 +31,195 @@ ALL_MODELS: Dict[str, Any] = {
     # Add additional models here...
 }
 
+# Data type of the time series sent to the tasks.  The API encodes
+# the series as the raw bytes of an array of this type and the tasks
+# decode it with ``np.frombuffer``, so both sides must agree on it.
+# Single precision halves the payload compared with ``float64``.
+SERIES_DTYPE = np.float32
+
+# Names of the error metrics computed for every model.
+METRIC_NAMES = ("mape", "mae", "mse", "rmse")
+
+# Minimum number of seconds between two progress updates of a task.
+# Each update is a round trip to the result backend, so updates for
+# models finishing in quick succession are coalesced.
+PROGRESS_INTERVAL = 0.2
+
+# For demonstration we define a small list of placeholder model
+# names.  In a real system you would iterate over ALL_MODELS.
+DUMMY_MODELS: List[str] = [
+    "Media Móvil Simple",
+    "Suavizado Exponencial",
+    "ARIMA",
+    "Prophet",
+    "Random Forest",
+]
+
+
+def _error_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
+    """Compute the error metrics reported for a model's predictions.
+
+    All four metrics are derived from a single array of residuals.
+    MAPE is expressed as a percentage, which is how the front‑end
+    displays it.  Actual values of zero are treated as one when
+    computing MAPE to avoid dividing by zero.
+
+    :param actual: The observed values
+    :param predicted: The values predicted by the model
+    :returns: A dictionary with the MAPE, MAE, MSE and RMSE
+    """
+    actual = np.asarray(actual, dtype=float)
+    err = actual - predicted
+    abs_err = np.abs(err)
+    mse = float(np.mean(err * err))
+    return {
+        "mape": float(np.mean(abs_err / np.abs(np.where(actual == 0, 1, actual)))) * 100,
+        "mae": float(np.mean(abs_err)),
+        "mse": mse,
+        "rmse": mse ** 0.5,
+    }
+
+
+def _fit_and_score(model_name: str, series: np.ndarray) -> Dict[str, Any]:
+    """Train a single model on ``series`` and compute its error metrics.
+
+    This function is defined at module level so that joblib can pickle
+    it and dispatch it to a pool of worker processes.  Each model is
+    independent of the others, so they can all be fitted in parallel.
+
+    :param model_name: The name of the model to train
+    :param series: The time series data as a one dimensional array
+    :returns: A dictionary with the model name, metrics and parameters
+    """
+    # Simulate model training time.  Replace this with real
+    # training and evaluation code.  Sleep for a short period to
+    # make progress visible when polling.
+    time.sleep(2)
+    # In a full implementation you would instantiate the model,
+    # split ``series`` into training and validation sets,
+    # compute predictions, then calculate metrics with
+    # ``_error_metrics``.  Here we fabricate deterministic metrics
+    # for demonstration.
+    i = DUMMY_MODELS.index(model_name)
+    return {
+        "model_name": model_name,
+        "metrics": {
+            "mape": 10.5 + i * 0.8,
+            "mae": 100.2 + i * 1.3,
+            "mse": 15000.1 + i * 100.0,
+            "rmse": 122.5 + i * 0.9,
+        },
+        "params": "{'n': 3}",
+    }
+
 
 @celery.task(bind=True)
-def run_all_models_task(self, data: List[float]) -> Dict[str, Any]:
+def run_all_models_task(self, data: bytes) -> Dict[str, Any]:
     """Evaluate a suite of forecasting models on the provided data.
 
-    The task iterates through a preconfigured list of models,
-    training each one and computing error metrics.  While running it
-    updates its state to communicate progress back to the caller.
-    Currently this function simulates work using dummy data.
+    The task fits every model in a pool of joblib worker processes,
+    one model per process, and computes error metrics for each.  As
+    models finish it updates its state, at most every
+    ``PROGRESS_INTERVAL`` seconds, to communicate progress back to
+    the caller.  Currently the models themselves are simulated.
 
     :param self: The bound Celery task instance used for updating
         state.  Celery binds ``self`` when ``bind=True`` is set.
-    :param data: The time series data to train models on
-    :returns: A dictionary with overall status and a list of results
+    :param data: The time series data to train models on, encoded as
+        the raw bytes of a ``SERIES_DTYPE`` array
+    :returns: A dictionary with overall status and the results.  The
+        results hold one list per field (model names, each metric and
+        parameters), ordered by ascending MAPE.
     """
-    series = pd.Series(data, dtype=float)
-    results: List[Dict[str, Any]] = []
-    # For demonstration we define a small list of placeholder model
-    # names.  In a real system you would iterate over ALL_MODELS.
-    dummy_models = [
-        "Media Móvil Simple",
-        "Suavizado Exponencial",
-        "ARIMA",
-        "Prophet",
-        "Random Forest",
-    ]
-    total_models = len(dummy_models)
-
-    for i, model_name in enumerate(dummy_models):
-        # Update the task state to report progress.  The ``meta``
-        # dictionary can include any additional information, such as
-        # the current model name and the number processed so far.
+    # joblib is only needed to run this task, so it is imported here
+    # rather than by every process that imports this module, such as
+    # the API enqueuing tasks.
+    from joblib import Parallel, delayed
+
+    # Decode the series once without copying so the same array is
+    # shipped to every worker process instead of rebuilding it per model.
+    series = np.frombuffer(data, dtype=SERIES_DTYPE)
+    total_models = len(DUMMY_MODELS)
+    # Results are gathered column by column: one list for the names
+    # and parameters and one contiguous array per metric.
+    names: List[str] = []
+    params: List[str] = []
+    metrics = {key: np.empty(total_models) for key in METRIC_NAMES}
+    parallel = Parallel(
+        n_jobs=min(total_models, os.cpu_count() or 1),
+        prefer="processes",
+        return_as="generator_unordered",
+    )
+
+    last_push = time.monotonic()
+    for result in parallel(delayed(_fit_and_score)(name, series) for name in DUMMY_MODELS):
+        i = len(names)
+        names.append(result['model_name'])
+        params.append(result['params'])
+        for key in METRIC_NAMES:
+            metrics[key][i] = result['metrics'][key]
+        now = time.monotonic()
+        if now - last_push < PROGRESS_INTERVAL and len(names) < total_models:
+            continue
+        last_push = now
+        # Update the task state to report progress.  Models complete
+        # in arbitrary order, so ``model`` names the one that has
+        # just finished and ``current`` the number processed so far.
         self.update_state(
             state='PROGRESS',
             meta={
-                'current': i + 1,
+                'current': len(names),
                 'total': total_models,
-                'model': model_name,
+                'model': result['model_name'],
             },
         )
-        # Simulate model training time.  Replace this with real
-        # training and evaluation code.  Sleep for a short period to
-        # make progress visible when polling.
-        time.sleep(2)
-        # In a full implementation you would instantiate the model,
-        # split ``series`` into training and validation sets,
-        # compute predictions, then calculate metrics.  Here we
-        # fabricate deterministic metrics for demonstration.
-        results.append({
-            "model_name": model_name,
-            "metrics": {
-                "mape": 10.5 + i * 0.8,
-                "mae": 100.2 + i * 1.3,
-                "mse": 15000.1 + i * 100.0,
-                "rmse": 122.5 + i * 0.9,
-            },
-            "params": "{'n': 3}",
-        })
-    # Sort the results by ascending MAPE so the best performer appears first
-    results.sort(key=lambda x: x['metrics']['mape'])
+    # Sort the results by ascending MAPE so the best performer appears
+    # first.  A single argsort over the MAPE array orders every column.
+    order = np.argsort(metrics['mape'], kind='stable')
     return {
         "status": "SUCCESS",
-        "results": results,
-    }
\ No newline at end of file
+        "results": {
+            "model_name": [names[i] for i in order],
+            "metrics": {key: values[order].tolist() for key, values in metrics.items()},
+            "params": [params[i] for i in order],
+        },
+    }
+
+
+@celery.task
+def run_one_model_task(data: bytes, model_name: str) -> Dict[str, Any]:
+    """Evaluate a single forecasting model on the provided data.
+
+    This is the per‑model counterpart of ``run_all_models_task`` and is
+    meant to be fanned out with ``run_models_bulk`` so that each model
+    can be picked up by a different worker.
+
+    :param data: The time series data to train the model on, encoded
+        as the raw bytes of a ``SERIES_DTYPE`` array
+    :param model_name: The name of the model to train
+    :returns: A dictionary with the model name, metrics and parameters
+    """
+    series = np.frombuffer(data, dtype=SERIES_DTYPE)
+    return _fit_and_score(model_name, series)
+
+
+def run_models_bulk(data: bytes, model_names: Optional[Iterable[str]] = None) -> List[AsyncResult]:
+    """Enqueue one ``run_one_model_task`` per model in a single batch.
+
+    Calling ``.delay()`` in a loop acquires a producer and broker
+    connection for every message.  Instead a single producer is taken
+    from the pool and reused to publish all of the tasks, so the whole
+    batch shares one connection to Redis.
+
+    :param data: The time series data, encoded as the raw bytes of a
+        ``SERIES_DTYPE`` array
+    :param model_names: The models to evaluate.  Defaults to every
+        available model.
+    :returns: The ``AsyncResult`` of each enqueued task, in order
+    """
+    names = list(model_names) if model_names is not None else DUMMY_MODELS
+    with celery.producer_pool.acquire(block=True) as producer:
+        return [
+            run_one_model_task.apply_async((data, name), producer=producer)
+            for name in names
+        ]
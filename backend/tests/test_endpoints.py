@@ -0,0 +1,241 @@
+"""
+Request level tests for the HTTP API endpoints.
+
+These tests exercise the routes through FastAPI's test client.  Redis
+is replaced by a small in‑memory stand‑in so no services are needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import endpoints
+from app.main import app
+from app.worker.celery_app import celery
+
+
+def make_csv(values):
+    """Return the contents of a CSV file with the given demand values."""
+    return "fecha,demanda\n" + "".join(f"{i},{value}\n" for i, value in enumerate(values))
+
+
+CSV = make_csv([100] * 11 + [124.1])
+
+
+class FakePubSub:
+    """Minimal asynchronous stand‑in for a Redis pub/sub.
+
+    It delivers the messages published beforehand on the subscribed
+    channels, then waits forever for more.
+    """
+
+    def __init__(self, published):
+        self.published = published
+        self.channels = set()
+        self.closed = False
+
+    async def subscribe(self, key):
+        self.channels.add(key)
+
+    async def listen(self):
+        for key in self.channels:
+            for data in self.published.get(key, []):
+                yield {"type": "message", "channel": key, "data": data}
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """Minimal asynchronous stand‑in for the Redis client."""
+
+    def __init__(self):
+        self.data = {}
+        self.published = {}
+        self.pubsubs = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pubsub(self):
+        pubsub = FakePubSub(self.published)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(endpoints, "redis", FakeRedis())
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    """Replace the evaluation task and collect the payloads it is given."""
+    payloads = []
+
+    def delay(payload):
+        payloads.append(payload)
+        return SimpleNamespace(id=f"task-{len(payloads)}")
+
+    monkeypatch.setattr(endpoints, "run_all_models_task", SimpleNamespace(delay=delay))
+    return payloads
+
+
+def process(client, contents):
+    return client.post("/api/process", files={"file": ("data.csv", contents, "text/csv")})
+
+
+def test_process(client, enqueued):
+    values = [100] * 11 + [123456789, None, 124.1]
+    response = process(client, make_csv(["" if v is None else v for v in values]))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["task_id"] == "task-1"
+    expected = np.array([v for v in values if v is not None], dtype=float)
+    cached = endpoints.redis.data[endpoints._series_key(body["data_hash"])]
+    np.testing.assert_array_equal(np.frombuffer(cached, dtype=endpoints.PARSE_DTYPE), expected)
+    payload = np.frombuffer(enqueued[0], dtype=endpoints.SERIES_DTYPE)
+    np.testing.assert_array_equal(payload, expected.astype(endpoints.SERIES_DTYPE))
+
+
+@pytest.mark.parametrize(
+    "contents, detail",
+    [
+        (make_csv([100] * 11), "entre 12 y 120"),
+        (make_csv([100] * 121), "entre 12 y 120"),
+        # The invalid value lies past the first 64 KiB block, so it is
+        # only reported if the file is read beyond the length limit.
+        (make_csv([100] * 20000 + ["mucho"]), "entre 12 y 120"),
+        ("fecha,ventas\n" + "".join(f"{i},1\n" for i in range(20)), "columna 'demanda'"),
+        (make_csv([100] * 11 + ["mucho"]), "no es válido"),
+    ],
+    ids=["too-short", "too-long", "stops-early", "missing-column", "non-numeric"],
+)
+def test_process_invalid(client, enqueued, contents, detail):
+    response = process(client, contents)
+    assert response.status_code == 400
+    assert detail in response.json()["detail"]
+    assert enqueued == []
+    assert endpoints.redis.data == {}
+
+
+def test_forecast_from_file(client):
+    response = client.post(
+        "/api/forecast",
+        params={"model_name": "ARIMA"},
+        files={"file": ("data.csv", CSV, "text/csv")},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["model_name"] == "ARIMA"
+    assert body["forecast"]["period"] == list(range(1, 13))
+    assert body["forecast"]["prediction"][0] == pytest.approx(130.305, abs=1e-12)
+    assert len(body["forecast"]["lower_bound"]) == 12
+    assert len(body["forecast"]["upper_bound"]) == 12
+
+
+@pytest.mark.parametrize("last_value", [124.1, 123456789])
+def test_forecast_from_cached_series(client, enqueued, last_value):
+    contents = make_csv([100] * 11 + [last_value])
+    data_hash = process(client, contents).json()["data_hash"]
+    from_cache = client.post("/api/forecast", params={"model_name": "ARIMA", "data_hash": data_hash})
+    from_file = client.post(
+        "/api/forecast",
+        params={"model_name": "ARIMA"},
+        files={"file": ("data.csv", contents, "text/csv")},
+    )
+    assert from_cache.status_code == 200
+    assert from_file.status_code == 200
+    assert from_cache.json() == from_file.json()
+
+
+def test_forecast_without_data(client):
+    response = client.post("/api/forecast", params={"model_name": "ARIMA"})
+    assert response.status_code == 400
+
+
+def test_forecast_missing_column(client):
+    response = client.post(
+        "/api/forecast",
+        params={"model_name": "ARIMA"},
+        files={"file": ("data.csv", "fecha,ventas\n2024-01,1\n", "text/csv")},
+    )
+    assert response.status_code == 400
+    assert "demanda" in response.json()["detail"]
+
+
+def test_stream_results_finished_task(client):
+    key = celery.backend.get_key_for_task("done")
+    result = {"status": "SUCCESS", "results": {"model_name": ["ARIMA"]}}
+    endpoints.redis.data[key] = celery.backend.encode({"status": "SUCCESS", "result": result})
+    with client.websocket_connect("/api/results/ws/done") as websocket:
+        assert websocket.receive_json() == result
+    assert endpoints.redis.pubsubs[0].closed
+
+
+def test_stream_results_client_disconnect(client):
+    with client.websocket_connect("/api/results/ws/unknown") as websocket:
+        assert websocket.receive_json() == {"status": "PENDING", "meta": {}}
+    # Leaving the context closes the socket from the client side; the
+    # handler must notice and drop its subscription.
+    pubsub = endpoints.redis.pubsubs[0]
+    assert pubsub.channels == {celery.backend.get_key_for_task("unknown")}
+    assert pubsub.closed
+
+
+def test_stream_results_forwards_updates(client):
+    key = celery.backend.get_key_for_task("running")
+    progress = {"current": 1, "total": 5, "model": "ARIMA"}
+    result = {"status": "SUCCESS", "results": {"model_name": ["ARIMA"]}}
+    endpoints.redis.published[key] = [
+        celery.backend.encode({"status": "PROGRESS", "result": progress}),
+        celery.backend.encode({"status": "SUCCESS", "result": result}),
+    ]
+    with client.websocket_connect("/api/results/ws/running") as websocket:
+        assert websocket.receive_json() == {"status": "PENDING", "meta": {}}
+        assert websocket.receive_json() == {"status": "PROGRESS", "meta": progress}
+        assert websocket.receive_json() == result
+        assert websocket.receive()["type"] == "websocket.close"
+    assert endpoints.redis.pubsubs[0].closed
+
+
+def store_meta(task_id, status, result):
+    key = celery.backend.get_key_for_task(task_id)
+    endpoints.redis.data[key] = celery.backend.encode({"status": status, "result": result})
+
+
+def test_get_results_bulk(client):
+    progress = {"current": 2, "total": 5, "model": "ARIMA"}
+    result = {"status": "SUCCESS", "results": {"model_name": ["ARIMA"]}}
+    store_meta("running", "PROGRESS", progress)
+    store_meta("done", "SUCCESS", result)
+    response = client.get("/api/results", params={"ids": "done,unknown,running"})
+    assert response.status_code == 200
+    assert response.json() == [
+        result,
+        {"status": "PENDING", "meta": {}},
+        {"status": "PROGRESS", "meta": progress},
+    ]
+
+
+@pytest.mark.parametrize("ids", ["", ",", ",,"])
+def test_get_results_bulk_without_ids(client, ids):
+    response = client.get("/api/results", params={"ids": ids})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_stream_timeout_follows_result_expiry():
+    assert endpoints.STREAM_TIMEOUT == celery.conf.result_expires
@@ -0,0 +1,27 @@
+"""
+Tests for the helpers used by the Celery evaluation tasks.
+"""
+
+import numpy as np
+import pytest
+
+from app.worker.tasks import _error_metrics
+
+
+def test_error_metrics():
+    metrics = _error_metrics(np.array([100.0, 200.0]), np.array([110.0, 180.0]))
+    # MAPE is a percentage, not a fraction
+    assert metrics["mape"] == pytest.approx(10.0)
+    assert metrics["mae"] == pytest.approx(15.0)
+    assert metrics["mse"] == pytest.approx(250.0)
+    assert metrics["rmse"] == pytest.approx(250.0 ** 0.5)
+
+
+def test_error_metrics_zero_actual():
+    # A zero actual value divides its error by one instead: the
+    # relative errors are 1 / 1, 1 / 2 and 3 / 4.
+    metrics = _error_metrics(np.array([0.0, 2.0, 4.0]), np.array([1.0, 1.0, 7.0]))
+    assert metrics["mape"] == pytest.approx(75.0)
+    assert metrics["mae"] == pytest.approx(5 / 3)
+    assert metrics["mse"] == pytest.approx(11 / 3)
+    assert metrics["rmse"] == pytest.approx((11 / 3) ** 0.5)
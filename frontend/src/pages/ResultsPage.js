@@ -5,34 +5,84 @@ import axios from 'axios';
 /**
  * Results page component.
  *
- * Uses the ``taskId`` route parameter to poll the backend for task
- * status and results.  While the background job is running it
- * displays a progress indicator.  Once completed it renders a
- * leaderboard of models ordered by MAPE.
+ * Uses the ``taskId`` route parameter to subscribe to task status
+ * updates pushed by the backend over a WebSocket.  While the
+ * background job is running it displays a progress indicator.  Once
+ * completed it renders a leaderboard of models ordered by MAPE.  If
+ * the task fails, or the socket closes before the task has finished,
+ * an error is shown instead.
  */
 export default function ResultsPage() {
   const { taskId } = useParams();
   const [taskStatus, setTaskStatus] = useState({ status: 'PENDING', meta: {} });
   const [results, setResults] = useState(null);
+  const [error, setError] = useState('');
 
   useEffect(() => {
-    const poll = setInterval(async () => {
+    // ``finished`` is set once the task reached a final state or the
+    // page was left, so that closing the socket is not treated as a
+    // lost connection.
+    let finished = false;
+    const socket = new WebSocket(`ws://localhost:8000/api/results/ws/${taskId}`);
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.status === 'FAILURE' || data.status === 'REVOKED') {
+        finished = true;
+        setError('El análisis de los modelos falló.');
+        socket.close();
+      } else if (data.status === 'SUCCESS') {
+        finished = true;
+        setResults(data.results);
+        socket.close();
+      } else {
+        setTaskStatus(data);
+      }
+    };
+    socket.onerror = (error) => {
+      console.error('Error fetching results:', error);
+    };
+    socket.onclose = async () => {
+      if (finished) {
+        return;
+      }
+      // The connection was lost before the task finished, e.g. because
+      // the API restarted.  Look up the task once before giving up.
       try {
         const response = await axios.get(`http://localhost:8000/api/results/${taskId}`);
+        if (finished) {
+          return;
+        }
         if (response.data.status === 'SUCCESS') {
           setResults(response.data.results);
-          clearInterval(poll);
         } else {
-          setTaskStatus(response.data);
+          setError('Se perdió la conexión con el servidor. Recarga la página para continuar.');
+        }
+      } catch (err) {
+        // ``/results/{task_id}`` answers with an error for failed tasks;
+        // no response at all means the API is unreachable.
+        if (!finished) {
+          setError(
+            err.response
+              ? 'El análisis de los modelos falló.'
+              : 'Se perdió la conexión con el servidor. Recarga la página para continuar.'
+          );
         }
-      } catch (error) {
-        console.error('Error fetching results:', error);
-        clearInterval(poll);
       }
-    }, 3000);
-    return () => clearInterval(poll);
+    };
+    return () => {
+      finished = true;
+      socket.close();
+    };
   }, [taskId]);
 
+  if (error) {
+    return (
+      <div className="text-center p-10">
+        <p className="text-red-500">{error}</p>
+      </div>
+    );
+  }
+
   if (!results) {
     const { meta } = taskStatus;
     const progress = meta?.total ? (meta.current / meta.total) * 100 : 0;
@@ -41,7 +91,7 @@ export default function ResultsPage() {
         <h2 className="text-2xl font-semibold mb-4">Analizando modelos...</h2>
         {meta?.model && (
           <p className="text-gray-600">
-            Calculando: {meta.model} ({meta.current} de {meta.total})
+            Completado: {meta.model} ({meta.current} de {meta.total})
           </p>
         )}
         <div className="w-full bg-gray-200 rounded-full h-4 mt-4">
@@ -68,14 +118,14 @@ export default function ResultsPage() {
             </tr>
           </thead>
           <tbody>
-            {results.map((res, index) => (
+            {results.model_name.map((modelName, index) => (
               <tr key={index} className={index === 0 ? 'bg-green-100' : ''}>
                 <td className="p-4 font-bold">
                   {index + 1} {index === 0 && '🏆'}
                 </td>
-                <td className="p-4">{res.model_name}</td>
-                <td className="p-4 font-semibold">{res.metrics.mape.toFixed(2)}%</td>
-                <td className="p-4">{res.metrics.mae.toFixed(2)}</td>
+                <td className="p-4">{modelName}</td>
+                <td className="p-4 font-semibold">{results.metrics.mape[index].toFixed(2)}%</td>
+                <td className="p-4">{results.metrics.mae[index].toFixed(2)}</td>
               </tr>
             ))}
           </tbody>